@@ -1,4 +1,3 @@
-from copy import deepcopy
 from dataclasses import dataclass
 from typing import Dict, Tuple, Optional
 from ofrak.component.modifier import Modifier
@@ -18,6 +17,18 @@ class CommentsAttributes(ResourceAttributes):
     comments: Dict[Optional[Range], str]
 
 
+def _copy_comments(comments: Dict[Optional[Range], str]) -> Dict[Optional[Range], str]:
+    """
+    Copy the existing comments, otherwise they would be modified in place and OFRAK would then
+    compare the new attributes with the existing ones and find they are the same, and report that
+    the resource wasn't modified.
+
+    Both the `Range` keys and the `str` values are immutable, so only the dict itself needs to be
+    copied; this avoids the overhead of `copy.deepcopy`.
+    """
+    return dict(comments)
+
+
 @dataclass
 class AddCommentModifierConfig(ComponentConfig):
     comment: Tuple[Optional[Range], str]
@@ -34,19 +45,17 @@ class AddCommentModifier(Modifier[AddCommentModifierConfig]):
         # Verify that the given range is valid for the given resource.
         config_range = config.comment[0]
         if config_range is not None:
-            if config_range.start < 0 or config_range.end > len(await resource.get_data()):
+            if config_range.start < 0 or config_range.end > await resource.get_data_length():
                 raise ValueError(
                     f"Range {config_range} is outside the bounds of "
                     f"resource {resource.get_id().hex()}"
                 )
 
         try:
-            # deepcopy the existing comments, otherwise they would be modified in place
-            # and OFRAK would then compare the new attributes with the existing ones and find
-            # they are the same, and report that the resource wasn't modified.
-            comments = deepcopy(resource.get_attributes(CommentsAttributes).comments)
+            existing_comments = resource.get_attributes(CommentsAttributes).comments
         except NotFoundError:
-            comments = {}
+            existing_comments = {}
+        comments = _copy_comments(existing_comments)
 
         # Here I'm appending appending overlapping comments with a new line.
         # Overwriting comments that share a range is counter intuitive and not easily understood without digging into the code.
@@ -78,14 +87,14 @@ class DeleteCommentModifier(Modifier[DeleteCommentModifierConfig]):
         :raises NotFoundError: if the comment range is not associated with a comment.
         """
         try:
-            comments = deepcopy(resource.get_attributes(CommentsAttributes).comments)
+            existing_comments = resource.get_attributes(CommentsAttributes).comments
         except NotFoundError:
-            comments = {}
-        try:
-            del comments[config.comment_range]
-        except KeyError:
+            existing_comments = {}
+        if config.comment_range not in existing_comments:
             raise NotFoundError(
                 f"Comment range {config.comment_range} not found in "
                 f"resource {resource.get_id().hex()}"
             )
+        comments = _copy_comments(existing_comments)
+        del comments[config.comment_range]
         resource.add_attributes(CommentsAttributes(comments=comments))
@@ -1,6 +1,7 @@
 #include <stddef.h>   // size_t, NULL
 #include <inttypes.h> // uint8_t, uint32_t
 #include <math.h>     // floor, log2
+#include <stdlib.h>   // malloc, calloc, free
 // Required to prevent exception with Python >= 3.10
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
@@ -10,46 +11,64 @@
 #define LOGGING_CHUNKS 10
 
 /***
- * Use a Python callback to log the current percent completion of the calculation
+ * Use a Python callback to log the current percent completion of the calculation. The GIL is
+ * released during the calculation, so it must be reacquired to call back into Python.
  */
 void log_percent(int percent, void* py_callback){
+    PyGILState_STATE gil_state = PyGILState_Ensure();
     PyObject *args = Py_BuildValue("(i)", percent);
     PyObject *result = PyEval_CallObject(py_callback, args);
     Py_XDECREF(result);
     Py_DECREF(args);
+    PyGILState_Release(gil_state);
 }
 
 /***
  * Calculate the Shannon entropy of a distribution of size `window_size` sampled from a sliding
- * window over `data`. The results of each calculation are stored in `result`.
+ * window over `data`. The entropy of every `skip`-th window (rounded down) is stored in
+ * `result`, until `result_size` values have been stored.
+ *
+ * Returns 0 on success, -1 if the arguments are invalid and -2 if memory allocation fails.
  */
-int entropy(uint8_t *data, size_t data_len, uint8_t *result, size_t window_size,
-            void* py_log_callback)
+int entropy(uint8_t *data, size_t data_len, uint8_t *result, size_t result_size, double skip,
+            size_t window_size, void* py_log_callback)
 {
     if (data == NULL || result == NULL || window_size > data_len || data_len == 0 ||
-        window_size == 0) {
+        window_size == 0 || skip < 1.0) {
         return -1;
     }
 
-    // Initialize and populate histogram and log probability list
+    // Precompute p * log2(p) for every count a byte value can have within the window, so that
+    // sliding the window only requires table lookups instead of log2 calls
+    double *log_probabilities = (double*) malloc((window_size + 1) * sizeof(double));
+    if (log_probabilities == NULL) {
+        return -2;
+    }
+    for (size_t count = 0; count <= window_size; count++) {
+        double probability = (double)count / window_size;
+        if (probability != 0.0) {
+            log_probabilities[count] = probability * log2(probability);
+        } else {
+            log_probabilities[count] = 0.0;
+        }
+    }
+
+    // Initialize and populate histogram
     double unscaled_entropy = 0.0;
     double log_window_size = log2((double)window_size);
-    double log_probabilities[HISTOGRAM_SIZE];
     uint32_t histogram[HISTOGRAM_SIZE] = {0};
 
     for (size_t i = 0; i < window_size; i++) {
         histogram[data[i]]++;
     }
     for (size_t i = 0; i < HISTOGRAM_SIZE; i++) {
-        double probability = (double)histogram[i] / window_size;
-        if (probability != 0.0) {
-            log_probabilities[i] = probability * log2(probability);
-        } else {
-            log_probabilities[i] = 0.0;
-        }
-        unscaled_entropy += log_probabilities[i];
+        unscaled_entropy += log_probabilities[histogram[i]];
     }
 
+    // Index into `result` of the next sample, and the window it is taken from
+    size_t sample = 0;
+    size_t sample_window = 0;
+
     // Loop over the data in chunks for logging purposes
     size_t chunk_size = data_len / LOGGING_CHUNKS;
     size_t i = window_size;
@@ -61,9 +80,13 @@ int entropy(uint8_t *data, size_t data_len, uint8_t *result, size_t window_size,
             max_i = data_len;
         }
         for (; i < max_i; i++) {
-            // Record the entropy for the latest window
-            result[i - window_size] =
-                (uint8_t)floor(MAX_BRIGHTNESS_FLOAT * -(unscaled_entropy / log_window_size));
+            // Record the entropy for the latest window, if it is sampled
+            if (sample < result_size && i - window_size == sample_window) {
+                result[sample] =
+                    (uint8_t)floor(MAX_BRIGHTNESS_FLOAT * -(unscaled_entropy / log_window_size));
+                sample++;
+                sample_window = (size_t)floor(sample * skip);
+            }
 
             // There is a byte that is removed from the sliding window as it advances. Remove it
             // from the probability distribution.
@@ -76,29 +99,17 @@ int entropy(uint8_t *data, size_t data_len, uint8_t *result, size_t window_size,
             }
 
             // Adjust the histogram based on the bytes added to and removed from the distributions
-            histogram[removed_byte]--;
-            double new_prob = (double)histogram[removed_byte] / window_size;
-            double old_log_prob = log_probabilities[removed_byte];
-            if (new_prob != 0.0) {
-                log_probabilities[removed_byte] = new_prob * log2(new_prob);
-            } else {
-                log_probabilities[removed_byte] = 0.0;
-            }
-            unscaled_entropy = unscaled_entropy - old_log_prob + log_probabilities[removed_byte];
+            uint32_t old_count = histogram[removed_byte]--;
+            unscaled_entropy = unscaled_entropy - log_probabilities[old_count] +
+                               log_probabilities[old_count - 1];
             if (unscaled_entropy > 0.0) {
                 // Adjust for floating point error
                 unscaled_entropy = 0.0;
             }
 
-            histogram[next_byte]++;
-            new_prob = (double)histogram[next_byte] / window_size;
-            old_log_prob = log_probabilities[next_byte];
-            if (new_prob != 0.0) {
-                log_probabilities[next_byte] = new_prob * log2(new_prob);
-            } else {
-                log_probabilities[next_byte] = 0.0;
-            }
-            unscaled_entropy = unscaled_entropy - old_log_prob + log_probabilities[next_byte];
+            old_count = histogram[next_byte]++;
+            unscaled_entropy = unscaled_entropy - log_probabilities[old_count] +
+                               log_probabilities[old_count + 1];
             if (unscaled_entropy > 0.0) {
                 // Adjust for floating point error
                 unscaled_entropy = 0.0;
@@ -108,6 +119,7 @@ int entropy(uint8_t *data, size_t data_len, uint8_t *result, size_t window_size,
         log_percent((i * 100) / data_len, py_log_callback);
     }
 
+    free(log_probabilities);
     return 0;
 }
 
@@ -116,12 +128,24 @@ PyObject* entropy_wrapper(PyObject* _, PyObject* args){
     Py_buffer data_buffer;
     size_t window_size;
     PyObject* py_log_percent;
+    PyObject* py_max_samples = Py_None;
 
-    if (!PyArg_ParseTuple(args, "y*nO", &data_buffer, &window_size, &py_log_percent)){
+    if (!PyArg_ParseTuple(args, "y*nO|O", &data_buffer, &window_size, &py_log_percent,
+                          &py_max_samples)){
         PyErr_SetString(PyExc_RuntimeError, "Failed to parse arguments to entropy_wrapper!");
         return NULL;
     }
 
+    size_t max_samples = 0;
+    if (py_max_samples != Py_None) {
+        max_samples = PyLong_AsSize_t(py_max_samples);
+        if (PyErr_Occurred() || max_samples == 0) {
+            PyBuffer_Release(&data_buffer);
+            PyErr_SetString(PyExc_ValueError, "max_samples must be a positive integer or None");
+            return NULL;
+        }
+    }
+
     if (data_buffer.len <= window_size){
         PyBuffer_Release(&data_buffer);
          // return b""
@@ -131,11 +155,36 @@ PyObject* entropy_wrapper(PyObject* _, PyObject* args){
     }
 
     uint8_t *data = data_buffer.buf;
-    size_t result_size = data_buffer.len - window_size;
+    size_t num_windows = data_buffer.len - window_size;
+    size_t result_size = num_windows;
+    double skip = 1.0;
+    if (max_samples != 0 && num_windows > max_samples) {
+        // Only compute the sampled windows' entropy, instead of sampling a full-size result
+        result_size = max_samples;
+        skip = (double)num_windows / (double)max_samples;
+    }
     uint8_t *result = (uint8_t*) calloc(result_size, sizeof(uint8_t));
+    if (result == NULL) {
+        PyBuffer_Release(&data_buffer);
+        return PyErr_NoMemory();
+    }
 
-    // Actual entropy calculation
-    entropy(data, data_buffer.len, result, window_size, py_log_percent);
+    // Actual entropy calculation. It does not touch any Python objects (other than through
+    // log_percent), so release the GIL to let other threads run in the meantime.
+    int status;
+    Py_BEGIN_ALLOW_THREADS
+    status = entropy(data, data_buffer.len, result, result_size, skip, window_size,
+                     py_log_percent);
+    Py_END_ALLOW_THREADS
+    if (status != 0) {
+        PyBuffer_Release(&data_buffer);
+        free(result);
+        if (status == -2) {
+            return PyErr_NoMemory();
+        }
+        PyErr_SetString(PyExc_ValueError, "Invalid arguments to entropy calculation!");
+        return NULL;
+    }
 
     PyObject* result_object = Py_BuildValue("y#", result, result_size);
 
@@ -153,7 +202,7 @@ static PyMethodDef methods[] = {
         "entropy_c",
         entropy_wrapper,
         METH_VARARGS,
-        "Calculate the Shannon entropy of a distribution of size `window_size` sampled from a sliding window over `data`. The results of each calculation are stored in `result`."
+        "Calculate the Shannon entropy of a distribution of size `window_size` sampled from a sliding window over `data`. If `max_samples` is given and there are more windows than that, only the entropy of `max_samples` evenly spaced windows is returned."
     },
     {NULL, NULL, 0, NULL}
 };
@@ -2,11 +2,16 @@ import asyncio
 import ctypes
 import logging
 import math
-from concurrent.futures import ProcessPoolExecutor
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from dataclasses import dataclass
+from typing import Iterator, NamedTuple, Optional, Tuple, Union
 
 from ofrak.component.analyzer import Analyzer
+from ofrak.core import tmpfs
 from ofrak.model.resource_model import ResourceAttributes
 from ofrak.resource import Resource, ResourceFactory
 from ofrak.service.data_service_i import DataServiceInterface
@@ -20,9 +25,64 @@ C_LOG_TYPE = ctypes.CFUNCTYPE(None, ctypes.c_uint8)
 
 try:
     from ofrak.core.entropy.entropy_c import entropy_c as entropy_func
+
+    ENTROPY_C_AVAILABLE = True
 except:
     from ofrak.core.entropy.entropy_py import entropy_py as entropy_func
 
+    ENTROPY_C_AVAILABLE = False
+
+try:
+    import numpy as np
+
+    NUMPY_INSTALLED = True
+except ImportError:
+    NUMPY_INSTALLED = False
+
+try:
+    from multiprocessing import resource_tracker, shared_memory  # type: ignore[attr-defined]
+
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    # Python < 3.8
+    SHARED_MEMORY_AVAILABLE = False
+
+
+# Below this size, the C extension summarizes data faster than it can be handed to a worker
+_MAX_INLINE_DATA_SIZE = 16 * 1024
+
+# Pools shared by all DataSummaryAnalyzer instances, so that workers are only started once per
+# OFRAK session rather than once per analyzer. The C extension releases the GIL, so threads are
+# enough to run it in parallel; the Python fallback needs worker processes.
+_POOL: Optional[ProcessPoolExecutor] = None
+_THREAD_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _THREAD_POOL
+    if _THREAD_POOL is None:
+        _THREAD_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _THREAD_POOL
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        if SHARED_MEMORY_AVAILABLE and os.name == "posix":
+            # Start the resource tracker before the workers so they share it with this process.
+            # Otherwise each worker gets its own tracker, which considers the shared memory
+            # blocks it attached to as leaked and tries to unlink them again at shutdown.
+            resource_tracker.ensure_running()
+        _POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _POOL
+
+
+def _reset_pool(broken_pool: ProcessPoolExecutor) -> None:
+    global _POOL
+    # Another analyzer may have already replaced the broken pool with a working one
+    if _POOL is broken_pool:
+        _POOL = None
+
 
 @dataclass(**ResourceAttributes.DATACLASS_PARAMS)
 class DataSummary(ResourceAttributes):
@@ -55,7 +115,6 @@ class DataSummaryAnalyzer(Analyzer[None, DataSummary]):
         resource_service: ResourceServiceInterface,
     ):
         super().__init__(resource_factory, data_service, resource_service)
-        self.pool = ProcessPoolExecutor()
         self.max_analysis_retries = 10
 
     async def analyze(self, resource: Resource, config=None, depth=0) -> DataSummary:
@@ -65,21 +124,94 @@ class DataSummaryAnalyzer(Analyzer[None, DataSummary]):
             )
 
         data = await resource.get_data()
+        if ENTROPY_C_AVAILABLE:
+            if len(data) < _MAX_INLINE_DATA_SIZE:
+                entropy, magnitude = sample_summary(data, resource.get_id())
+            else:
+                # No need to copy the data to another process, since the GIL is released
+                entropy, magnitude = await asyncio.get_running_loop().run_in_executor(
+                    _get_thread_pool(), sample_summary, data, resource.get_id()
+                )
+            return DataSummary(entropy, magnitude)
+
         # Run blocking computations in separate processes
+        pool = _get_pool()
         try:
-            entropy = await asyncio.get_running_loop().run_in_executor(
-                self.pool, sample_entropy, data, resource.get_id()
-            )
-            magnitude = await asyncio.get_running_loop().run_in_executor(
-                self.pool, sample_magnitude, data
-            )
+            with _share_data(data) as shared_data:
+                entropy, magnitude = await asyncio.get_running_loop().run_in_executor(
+                    pool, _sample_summary_on_shared_data, shared_data, resource.get_id()
+                )
             return DataSummary(entropy, magnitude)
         except BrokenProcessPool:
             # If the previous one was aborted, try again with a new pool
-            self.pool = ProcessPoolExecutor()
+            _reset_pool(pool)
             return await self.analyze(resource, config=config, depth=depth + 1)
 
 
+class _SharedData(NamedTuple):
+    """
+    Handle to resource data copied into a shared memory block, which worker processes can
+    attach to instead of receiving the whole data pickled over a pipe.
+    """
+
+    name: str
+    size: int
+
+
+@contextmanager
+def _share_data(data: bytes) -> Iterator[Union[bytes, _SharedData]]:
+    """
+    Copy `data` into shared memory for the duration of the context, and yield a handle to it. If
+    shared memory is unavailable, the data is yielded as-is and will be pickled to the workers.
+    """
+    if not SHARED_MEMORY_AVAILABLE or len(data) == 0 or not _shared_memory_fits(len(data)):
+        yield data
+        return
+
+    shm = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        shm.buf[: len(data)] = data
+        yield _SharedData(shm.name, len(data))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _shared_memory_fits(size: int) -> bool:
+    """
+    Check that a shared memory block of `size` bytes can be backed. On Linux, shared memory lives
+    in a tmpfs, and writing past its capacity raises SIGBUS instead of an exception.
+    """
+    if sys.platform != "linux":
+        return True
+    return tmpfs.tmpfs_has_room(size)
+
+
+def _sample_summary_on_shared_data(
+    shared_data: Union[bytes, _SharedData], resource_id: bytes
+) -> Tuple[bytes, bytes]:  # pragma: no cover
+    """
+    Run `sample_summary` in a worker process on the data referred to by `shared_data`.
+    """
+    if not isinstance(shared_data, _SharedData):
+        return sample_summary(shared_data, resource_id)
+
+    shm = shared_memory.SharedMemory(name=shared_data.name)
+    try:
+        with shm.buf[: shared_data.size] as data:
+            return sample_summary(data, resource_id)
+    finally:
+        shm.close()
+
+
+def sample_summary(data: bytes, resource_id: bytes) -> Tuple[bytes, bytes]:  # pragma: no cover
+    """
+    Return both the entropy and the magnitude samples of the data, so that a worker process only
+    needs to be handed the data once.
+    """
+    return sample_entropy(data, resource_id), sample_magnitude(data)
+
+
 def sample_entropy(
     data: bytes, resource_id: bytes, window_size=256, max_samples=2**20
 ) -> bytes:  # pragma: no cover
@@ -100,20 +232,25 @@ def sample_entropy(
     def log_percent(percent):  # pragma: no cover
         LOGGER.info(f"Entropy calculation {percent}% complete for {resource_id.hex()}")
 
-    result = entropy_func(data, window_size, log_percent)
-
-    if len(result) <= max_samples:
-        return result
-
-    # Sample the calculated array if it is too large
-    skip = len(result) / max_samples
-    return bytes(result[math.floor(i * skip)] for i in range(max_samples))
+    # Only the sampled windows are computed if the entropy data would be too large
+    return entropy_func(data, window_size, log_percent, max_samples)
 
 
 def sample_magnitude(data: bytes, max_samples=2**20) -> bytes:  # pragma: no cover
     if len(data) < max_samples:
-        # TODO: Should this be a shallow copy instead?
-        return data
+        # Convert in case data is a memoryview; returns data itself if it is already bytes
+        return bytes(data)
     else:
-        skip = len(data) / max_samples
-        return bytes(data[math.floor(i * skip)] for i in range(max_samples))
+        return _downsample(data, max_samples)
+
+
+def _downsample(data: bytes, max_samples: int) -> bytes:  # pragma: no cover
+    """
+    Return `max_samples` bytes of `data`, taken at evenly spaced indices.
+    """
+    skip = len(data) / max_samples
+    if NUMPY_INSTALLED:
+        # Same indices as below, but gathered in a single vectorized operation
+        indices = (np.arange(max_samples, dtype=np.float64) * skip).astype(np.int64)
+        return np.frombuffer(data, dtype=np.uint8)[indices].tobytes()
+    return bytes(data[math.floor(i * skip)] for i in range(max_samples))
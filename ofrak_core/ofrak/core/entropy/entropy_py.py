@@ -1,15 +1,25 @@
+import functools
 import logging
 import math
-from typing import Callable, List, Optional
+from typing import Callable, Optional, Tuple
 
 
 def entropy_py(
-    data: bytes, window_size: int, log_percent: Optional[Callable[[int], None]] = None
+    data: bytes,
+    window_size: int,
+    log_percent: Optional[Callable[[int], None]] = None,
+    max_samples: Optional[int] = None,
 ) -> bytes:
     """
     Return a list of entropy values where each value represents the Shannon entropy of the byte
-    value distribution over a fixed-size, sliding window.
+    value distribution over a fixed-size, sliding window. If `max_samples` is given and there are
+    more windows than that, only the entropy of `max_samples` evenly spaced windows is returned.
+
+    :raises ValueError: if `max_samples` is not a positive integer or None
     """
+    if max_samples is not None and max_samples <= 0:
+        raise ValueError("max_samples must be a positive integer or None")
+
     if log_percent is None:
         log_percent = lambda x: None
     else:
@@ -24,13 +34,45 @@ def entropy_py(
     for b in data[:window_size]:
         histogram[b] += 1
 
+    # Keep a running (unscaled) Shannon entropy sum, so that sliding the window only requires
+    # replacing the terms of the two byte values whose counts changed
+    log_probabilities = _log_probability_table(window_size)
+    unscaled_entropy = sum(log_probabilities[count] for count in histogram)
+    log_window_size = math.log2(window_size)
+
+    num_windows = max(len(data) - window_size, 0)
+    if max_samples is None or num_windows <= max_samples:
+        num_samples = num_windows
+        skip = 1.0
+    else:
+        # Only compute the sampled windows' entropy, instead of sampling a full-size result
+        num_samples = max_samples
+        skip = num_windows / max_samples
+
     # Calculate the entropy using a sliding window
-    entropy = [0] * (len(data) - window_size)
+    entropy = bytearray(num_samples)
+    sample = 0
+    sample_window = 0
     last_percent_logged = 0
-    for i in range(len(entropy)):
-        entropy[i] = math.floor(255 * _shannon_entropy(histogram, window_size))
-        histogram[data[i]] -= 1
-        histogram[data[i + window_size]] += 1
+    for i in range(num_windows):
+        if sample < num_samples and i == sample_window:
+            entropy[sample] = math.floor(255 * -(unscaled_entropy / log_window_size))
+            sample += 1
+            sample_window = math.floor(sample * skip)
+        removed_byte = data[i]
+        next_byte = data[i + window_size]
+        if removed_byte != next_byte:
+            for b, delta in ((removed_byte, -1), (next_byte, 1)):
+                old_count = histogram[b]
+                histogram[b] += delta
+                unscaled_entropy = (
+                    unscaled_entropy
+                    - log_probabilities[old_count]
+                    + log_probabilities[old_count + delta]
+                )
+                if unscaled_entropy > 0.0:
+                    # Adjust for floating point error
+                    unscaled_entropy = 0.0
         percent = int((i * 100) / len(data))
         if percent > last_percent_logged and percent % 10 == 0:
             log_percent(percent)
@@ -38,20 +80,15 @@ def entropy_py(
     return bytes(entropy)
 
 
-def _shannon_entropy(distribution: List[int], window_size: int) -> float:
+@functools.lru_cache(maxsize=None)
+def _log_probability_table(window_size: int) -> Tuple[float, ...]:
     """
-    Return the Shannon entropy of the input probability distribution (represented as a histogram
-    counting byte occurrences over a window of known size).
-
-    Shannon entropy represents how uniform a probability distribution is. Since more uniform
-    implies less predictable (because the probability of any outcome is equally likely in a
-    uniform distribution), a sample with higher entropy is "more random" than one with lower
-    entropy. More here: <https://en.wikipedia.org/wiki/Entropy_(information_theory)>.
+    Return the contribution `p * log2(p)` to the Shannon entropy sum of a byte value occurring
+    `n` times in the window, for each `n` from 0 to `window_size`.
     """
-
-    result = 0.0
-    for num_occurrences in distribution:
+    table = []
+    for num_occurrences in range(window_size + 1):
         probability = num_occurrences / window_size
         # Note that the zero check is required because the domain of log2 is the positive reals
-        result += probability * math.log2(probability) if probability != 0.0 else 0.0
-    return -result / math.log2(window_size)
+        table.append(probability * math.log2(probability) if probability != 0.0 else 0.0)
+    return tuple(table)
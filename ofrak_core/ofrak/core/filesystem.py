@@ -1,6 +1,8 @@
+import asyncio
 import os
 import stat
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, Iterable, Optional, Type, Union
 
@@ -338,107 +340,129 @@ class FilesystemRoot(ResourceView):
                 f"Could not initialize from disk. Found a file instead of a directory: {root_path}"
             )
 
+        read_pool = _get_read_pool()
         for root, dirs, files in os.walk(root_path):
-            for d in sorted(dirs):
-                absolute_path = os.path.join(root, d)
-                relative_path = os.path.join(os.path.relpath(root, root_path), d)
-                folder_attributes_stat = os.lstat(absolute_path)
-
-                mode = folder_attributes_stat.st_mode
-                mode_tests = [
-                    stat.S_ISCHR,
-                    stat.S_ISBLK,
-                    stat.S_ISFIFO,
-                    stat.S_ISSOCK,
-                    stat.S_ISDOOR,
-                    stat.S_ISPORT,
-                    stat.S_ISWHT,
-                    stat.S_ISREG,
-                ]
-                for mode_test in mode_tests:
-                    if mode_test(mode) != 0:
-                        raise NotImplementedError(
-                            f"Directory {absolute_path} has an unsupported special file type: "
-                            f"{stat.S_IFMT(mode):o}. {mode_test.__name__} should be false."
+            # Start reading the contents of all regular files in this directory concurrently, so
+            # that the reads overlap with each other and with the resource creation below
+            absolute_paths = {f: os.path.join(root, f) for f in files}
+            file_contents = {
+                f: read_pool.submit(_read_file, absolute_paths[f])
+                for f in files
+                if not os.path.islink(absolute_paths[f]) and os.path.isfile(absolute_paths[f])
+            }
+            try:
+                for d in sorted(dirs):
+                    absolute_path = os.path.join(root, d)
+                    relative_path = os.path.join(os.path.relpath(root, root_path), d)
+                    folder_attributes_stat = os.lstat(absolute_path)
+
+                    mode = folder_attributes_stat.st_mode
+                    mode_tests = [
+                        stat.S_ISCHR,
+                        stat.S_ISBLK,
+                        stat.S_ISFIFO,
+                        stat.S_ISSOCK,
+                        stat.S_ISDOOR,
+                        stat.S_ISPORT,
+                        stat.S_ISWHT,
+                        stat.S_ISREG,
+                    ]
+                    for mode_test in mode_tests:
+                        if mode_test(mode) != 0:
+                            raise NotImplementedError(
+                                f"Directory {absolute_path} has an unsupported special file type: "
+                                f"{stat.S_IFMT(mode):o}. {mode_test.__name__} should be false."
+                            )
+
+                    folder_attributes_xattr = self._get_xattr_map(absolute_path)
+                    if os.path.islink(absolute_path):
+                        await self.add_special_file_entry(
+                            relative_path,
+                            SymbolicLink(
+                                relative_path,
+                                folder_attributes_stat,
+                                folder_attributes_xattr,
+                                os.readlink(absolute_path),
+                            ),
                         )
-
-                folder_attributes_xattr = self._get_xattr_map(absolute_path)
-                if os.path.islink(absolute_path):
-                    await self.add_special_file_entry(
-                        relative_path,
-                        SymbolicLink(
+                    else:
+                        await self.add_folder(
                             relative_path,
                             folder_attributes_stat,
                             folder_attributes_xattr,
-                            os.readlink(absolute_path),
-                        ),
-                    )
-                else:
-                    await self.add_folder(
-                        relative_path,
-                        folder_attributes_stat,
-                        folder_attributes_xattr,
-                    )
-            for f in sorted(files):
-                absolute_path = os.path.join(root, f)
-                relative_path = os.path.normpath(os.path.join(os.path.relpath(root, root_path), f))
-                file_attributes_stat = os.lstat(absolute_path)
-
-                mode = file_attributes_stat.st_mode
-                mode_tests = [
-                    stat.S_ISSOCK,
-                    stat.S_ISDOOR,
-                    stat.S_ISPORT,
-                    stat.S_ISWHT,
-                    stat.S_ISDIR,
-                ]
-                for mode_test in mode_tests:
-                    if mode_test(mode) != 0:
-                        raise NotImplementedError(
-                            f"Directory {absolute_path} has an unsupported special file type: "
-                            f"{stat.S_IFMT(mode):o}. {mode_test.__name__} should be false."
                         )
-
-                file_attributes_xattr = self._get_xattr_map(absolute_path)
-                if os.path.islink(absolute_path):
-                    await self.add_special_file_entry(
-                        relative_path,
-                        SymbolicLink(
-                            relative_path,
-                            file_attributes_stat,
-                            file_attributes_xattr,
-                            os.readlink(absolute_path),
-                        ),
+                for f in sorted(files):
+                    absolute_path = absolute_paths[f]
+                    relative_path = os.path.normpath(
+                        os.path.join(os.path.relpath(root, root_path), f)
                     )
-                elif os.path.isfile(absolute_path):
-                    with open(absolute_path, "rb") as fh:
+                    file_attributes_stat = os.lstat(absolute_path)
+
+                    mode = file_attributes_stat.st_mode
+                    mode_tests = [
+                        stat.S_ISSOCK,
+                        stat.S_ISDOOR,
+                        stat.S_ISPORT,
+                        stat.S_ISWHT,
+                        stat.S_ISDIR,
+                    ]
+                    for mode_test in mode_tests:
+                        if mode_test(mode) != 0:
+                            raise NotImplementedError(
+                                f"Directory {absolute_path} has an unsupported special file type: "
+                                f"{stat.S_IFMT(mode):o}. {mode_test.__name__} should be false."
+                            )
+
+                    file_attributes_xattr = self._get_xattr_map(absolute_path)
+                    if os.path.islink(absolute_path):
+                        await self.add_special_file_entry(
+                            relative_path,
+                            SymbolicLink(
+                                relative_path,
+                                file_attributes_stat,
+                                file_attributes_xattr,
+                                os.readlink(absolute_path),
+                            ),
+                        )
+                    elif f in file_contents:
                         await self.add_file(
                             relative_path,
-                            fh.read(),
+                            await asyncio.wrap_future(file_contents.pop(f)),
                             file_attributes_stat,
                             file_attributes_xattr,
                         )
-                elif stat.S_ISFIFO(mode):
-                    await self.add_special_file_entry(
-                        relative_path,
-                        FIFOPipe(relative_path, file_attributes_stat, file_attributes_xattr),
-                    )
-                elif stat.S_ISBLK(mode):
-                    await self.add_special_file_entry(
-                        relative_path,
-                        BlockDevice(relative_path, file_attributes_stat, file_attributes_xattr),
-                    )
-                elif stat.S_ISCHR(mode):
-                    await self.add_special_file_entry(
-                        relative_path,
-                        CharacterDevice(relative_path, file_attributes_stat, file_attributes_xattr),
-                    )
-                else:
-                    raise NotImplementedError(
-                        f"File {absolute_path} appeared to be a supported "
-                        f"type but did not match any of the known cases to "
-                        f"create a resource. Stat: {stat.S_IFMT(mode):o}"
-                    )
+                    elif stat.S_ISFIFO(mode):
+                        await self.add_special_file_entry(
+                            relative_path,
+                            FIFOPipe(relative_path, file_attributes_stat, file_attributes_xattr),
+                        )
+                    elif stat.S_ISBLK(mode):
+                        await self.add_special_file_entry(
+                            relative_path,
+                            BlockDevice(relative_path, file_attributes_stat, file_attributes_xattr),
+                        )
+                    elif stat.S_ISCHR(mode):
+                        await self.add_special_file_entry(
+                            relative_path,
+                            CharacterDevice(
+                                relative_path, file_attributes_stat, file_attributes_xattr
+                            ),
+                        )
+                    else:
+                        raise NotImplementedError(
+                            f"File {absolute_path} appeared to be a supported "
+                            f"type but did not match any of the known cases to "
+                            f"create a resource. Stat: {stat.S_IFMT(mode):o}"
+                        )
+            finally:
+                # If adding an entry failed, drop the reads of the remaining files that have not
+                # started yet, and wait for the ones already running
+                for future in file_contents.values():
+                    future.cancel()
+                await asyncio.gather(
+                    *(asyncio.wrap_future(future) for future in file_contents.values()),
+                    return_exceptions=True,
+                )
 
     async def flush_to_disk(
         self,
@@ -662,3 +686,18 @@ class FilesystemRoot(ResourceView):
         for attr in xattr.listxattr(path, symlink=True):  # Don't follow links
             xattr_dict[attr] = xattr.getxattr(path, attr)
         return xattr_dict
+
+
+_READ_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _get_read_pool() -> ThreadPoolExecutor:
+    global _READ_POOL
+    if _READ_POOL is None:
+        _READ_POOL = ThreadPoolExecutor()
+    return _READ_POOL
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as fh:
+        return fh.read()
@@ -0,0 +1,15 @@
+import os
+import shutil
+
+# In-memory filesystem, used for POSIX shared memory on Linux
+TMPFS_PATH = "/dev/shm"
+
+
+def tmpfs_has_room(size: int) -> bool:
+    """
+    Return whether the tmpfs at `TMPFS_PATH` exists, is writable, and has more than `size` bytes
+    free. It is small by default in Docker containers (64 MB).
+    """
+    if not os.path.isdir(TMPFS_PATH) or not os.access(TMPFS_PATH, os.W_OK):
+        return False
+    return shutil.disk_usage(TMPFS_PATH).free > size
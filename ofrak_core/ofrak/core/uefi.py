@@ -1,16 +1,19 @@
+import errno
 import os
 import asyncio
 import logging
 import tempfile
 from dataclasses import dataclass
 from subprocess import CalledProcessError
+from typing import Optional
 
 from ofrak.component.unpacker import Unpacker
 from ofrak.resource import Resource
+from ofrak.core import tmpfs
 from ofrak.core.filesystem import File, Folder, FilesystemRoot, SpecialFileType
 
 
-from ofrak.model.component_model import ComponentExternalTool
+from ofrak.model.component_model import ComponentConfig, ComponentExternalTool
 from ofrak.core.pe.model import Pe
 
 LOGGER = logging.getLogger(__name__)
@@ -25,30 +28,85 @@ class Uefi(FilesystemRoot, Pe):
     """
 
 
-class UefiUnpacker(Unpacker[None]):
+@dataclass
+class UefiUnpackerConfig(ComponentConfig):
+    """
+    :ivar use_tmpfs: extract the ROM in the `/dev/shm` tmpfs (if it has room for the ROM itself),
+    so that the extracted contents are not written to and read back from disk. The extracted tree
+    can be many times larger than the ROM; if extraction runs out of space there, it is retried in
+    the default temporary directory.
+    """
+
+    use_tmpfs: bool = False
+
+
+class UefiUnpacker(Unpacker[UefiUnpackerConfig]):
     """Unpack a UEFI binary. This current method cannot repack after modification because UEFITool cannot support it."""
 
     targets = (Uefi,)
     children = (File, Folder, SpecialFileType)
     external_dependencies = (UEFIEXTRACT,)
 
-    async def unpack(self, resource: Resource, config=None):
+    async def unpack(self, resource: Resource, config: Optional[UefiUnpackerConfig] = None):
+        if config is None:
+            config = UefiUnpackerConfig()
+
+        if config.use_tmpfs:
+            tmpfs_dir = _get_tmpfs_dir(await resource.get_data_length())
+            if tmpfs_dir is not None:
+                try:
+                    await self._extract(resource, tmpfs_dir)
+                    return
+                except OSError as e:
+                    if e.errno != errno.ENOSPC:
+                        raise
+                    LOGGER.warning(
+                        f"Ran out of space extracting the UEFI ROM in {tmpfs_dir}; retrying in "
+                        f"the default temporary directory"
+                    )
+        await self._extract(resource, None)
+
+    async def _extract(self, resource: Resource, temp_dir_location: Optional[str]):
+        """
+        Extract the ROM in a temporary directory under `temp_dir_location`.
+
+        :raises OSError: with `errno.ENOSPC` if `temp_dir_location` is the tmpfs and it ran out of
+        space during extraction
+        """
         ROM_FILE = "uefi.rom"
 
-        with tempfile.TemporaryDirectory() as temp_flush_dir:
-            # uefiextract always outputs to the CWD, so we must run this command from the temp dir to not leave behind artifacts
-            os.chdir(temp_flush_dir)
-            await resource.flush_data_to_disk(ROM_FILE)
+        rom_size = await resource.get_data_length()
+        with tempfile.TemporaryDirectory(dir=temp_dir_location) as temp_flush_dir:
+            await resource.flush_data_to_disk(os.path.join(temp_flush_dir, ROM_FILE))
             cmd = [
                 "uefiextract",
                 ROM_FILE,
             ]
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
+                # uefiextract always outputs to the CWD, so we must run this command from the temp dir to not leave behind artifacts
+                cwd=temp_flush_dir,
             )
             returncode = await proc.wait()
             if proc.returncode:
-                raise CalledProcessError(returncode=returncode, cmd=cmd)
+                error = CalledProcessError(returncode=returncode, cmd=cmd)
+                # uefiextract does not report why it failed, so check whether the tmpfs filled up
+                # while the extracted files are still there
+                if temp_dir_location == tmpfs.TMPFS_PATH and not tmpfs.tmpfs_has_room(rom_size):
+                    raise OSError(
+                        errno.ENOSPC, f"uefiextract ran out of space in {temp_dir_location}"
+                    ) from error
+                raise error
 
             uefi_view = await resource.view_as(Uefi)
             await uefi_view.initialize_from_disk(os.path.join(temp_flush_dir, f"{ROM_FILE}.dump"))
+
+
+def _get_tmpfs_dir(required_size: int) -> Optional[str]:
+    """
+    Return the tmpfs directory if it is writable and has room for `required_size` bytes;
+    otherwise, return `None` to use the default temporary directory.
+    """
+    if tmpfs.tmpfs_has_room(required_size):
+        return tmpfs.TMPFS_PATH
+    return None
@@ -1,7 +1,14 @@
+import asyncio
+import math
+import os
 import os.path
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 import pytest
 from ofrak.core.entropy import DataSummaryAnalyzer, DataSummary
+from ofrak.core.entropy import entropy as entropy_module
 
 from ofrak import OFRAKContext
 import test_ofrak.components
@@ -53,6 +60,138 @@ async def test_analyzer(ofrak_context: OFRAKContext, test_file_path):
     ), f"Entropy analysis for {test_file_path} differs from reference entropy."
 
 
+def _large_test_data() -> bytes:
+    """
+    Return data above both the inline analysis threshold and the maximum number of samples, with
+    regions of varying entropy.
+    """
+    size = 2**20 + 12345
+    rand = random.Random(0)
+    random_data = rand.getrandbits(8 * size).to_bytes(size, "little")
+    return bytes(b if (i // 4096) % 3 else b % 4 for i, b in enumerate(random_data))
+
+
+async def test_analyzer_large_data(ofrak_context: OFRAKContext):
+    """
+    Test the analyzer on data too large to be summarized inline, which is sampled down to the
+    maximum number of samples.
+    """
+    data = _large_test_data()
+    full_entropy = entropy_c(data, 256, lambda s: None)
+    skip = len(full_entropy) / 2**20
+    expected_entropy = bytes(full_entropy[math.floor(i * skip)] for i in range(2**20))
+
+    root = await ofrak_context.create_root_resource("large_data", data)
+    await root.run(DataSummaryAnalyzer)
+    data_summary = root.get_attributes(DataSummary)
+    assert data_summary.entropy_samples == expected_entropy
+    skip = len(data) / 2**20
+    assert data_summary.magnitude_samples == bytes(
+        data[math.floor(i * skip)] for i in range(2**20)
+    )
+
+
+@pytest.fixture
+def python_entropy_backend(monkeypatch):
+    """
+    Analyze with the pure Python entropy implementation, as if the C extension were missing, in a
+    fresh process pool.
+    """
+    monkeypatch.setattr(entropy_module, "ENTROPY_C_AVAILABLE", False)
+    monkeypatch.setattr(entropy_module, "entropy_func", entropy_py)
+    monkeypatch.setattr(entropy_module, "_POOL", None)
+    yield
+    if entropy_module._POOL is not None:
+        entropy_module._POOL.shutdown()
+
+
+def _shared_memory_blocks():
+    if not os.path.isdir("/dev/shm"):
+        return set()
+    return set(os.listdir("/dev/shm"))
+
+
+async def test_analyzer_python_backend(ofrak_context: OFRAKContext, python_entropy_backend):
+    """
+    Test that the Python fallback, which runs in worker processes and receives data through shared
+    memory, summarizes concurrent resources like the C extension, and cleans up after itself.
+    """
+    rand = random.Random(0)
+    datas = [bytes(rand.randrange(i % 256 + 1) for i in range(32 * 1024)) for _ in range(3)]
+    resources = [
+        await ofrak_context.create_root_resource(f"data_{i}", data) for i, data in enumerate(datas)
+    ]
+    shared_memory_before = _shared_memory_blocks()
+
+    await asyncio.gather(*(resource.run(DataSummaryAnalyzer) for resource in resources))
+
+    for resource, data in zip(resources, datas):
+        data_summary = resource.get_attributes(DataSummary)
+        assert data_summary.entropy_samples == entropy_c(data, 256, lambda s: None)
+        assert data_summary.magnitude_samples == data
+    assert _shared_memory_blocks() == shared_memory_before
+
+
+async def test_analyzer_broken_process_pool(
+    ofrak_context: OFRAKContext, python_entropy_backend, monkeypatch
+):
+    """
+    Test that the analyzer replaces a process pool that broke, and retries the analysis.
+    """
+    broken_pool = ProcessPoolExecutor(max_workers=1)
+    with pytest.raises(BrokenProcessPool):
+        broken_pool.submit(os._exit, 1).result()
+    monkeypatch.setattr(entropy_module, "_POOL", broken_pool)
+
+    rand = random.Random(0)
+    data = bytes(rand.randrange(i % 256 + 1) for i in range(32 * 1024))
+    root = await ofrak_context.create_root_resource("data", data)
+    await root.run(DataSummaryAnalyzer)
+
+    assert root.get_attributes(DataSummary).entropy_samples == entropy_c(data, 256, lambda s: None)
+    assert entropy_module._POOL is not broken_pool
+
+
+@pytest.mark.parametrize("max_samples", [0, 1, 1000, 4096])
+def test_entropy_max_samples(max_samples: int):
+    """
+    Test that computing only the sampled windows gives the same result as sampling the entropy of
+    all windows, and that a non-positive number of samples is rejected.
+    """
+    rand = random.Random(0)
+    data = bytes(rand.randrange(i % 256 + 1) for i in range(10000))
+    if max_samples == 0:
+        with pytest.raises(ValueError):
+            entropy_c(data, 256, lambda s: None, max_samples)
+        with pytest.raises(ValueError):
+            entropy_py(data, 256, None, max_samples)
+        return
+
+    full_entropy = entropy_c(data, 256, lambda s: None)
+    skip = len(full_entropy) / max_samples
+    expected_entropy = bytes(full_entropy[math.floor(i * skip)] for i in range(max_samples))
+
+    assert entropy_c(data, 256, lambda s: None, max_samples) == expected_entropy
+    assert entropy_py(data, 256, None, max_samples) == expected_entropy
+
+
+@pytest.mark.parametrize("max_samples", [1, 1000, 2**20])
+@pytest.mark.parametrize("buffer_type", [bytes, memoryview])
+def test_sample_magnitude_numpy(monkeypatch, max_samples: int, buffer_type):
+    """
+    Test that downsampling with NumPy picks the same bytes as the pure Python fallback, including
+    on the memoryview of shared memory that worker processes receive.
+    """
+    pytest.importorskip("numpy")
+    assert entropy_module.NUMPY_INSTALLED
+    data = buffer_type(_large_test_data())
+    vectorized = entropy_module.sample_magnitude(data, max_samples)
+
+    monkeypatch.setattr(entropy_module, "NUMPY_INSTALLED", False)
+    assert vectorized == entropy_module.sample_magnitude(data, max_samples)
+    assert len(vectorized) == max_samples
+
+
 def _almost_equal(bytes1: bytes, bytes2: bytes) -> bool:
     """
     Return true if each pair of bytes in each position of two byte arrays differs by no more than
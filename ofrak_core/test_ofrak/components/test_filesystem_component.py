@@ -1,13 +1,17 @@
 import os
 import re
+import socket
 import stat
 import subprocess
 import tempfile
+import threading
+import time
 
 import pytest
 
 from ofrak import OFRAKContext
 from ofrak.core import FilesystemRoot
+from ofrak.core import filesystem
 from ofrak.core.binary import GenericBinary
 from ofrak.core.filesystem import (
     FilesystemEntry,
@@ -90,6 +94,62 @@ class TestFilesystemRoot:
             initialized_tree = await resource.summarize_tree()
             assert original_tree != initialized_tree
 
+    async def test_initialize_from_disk_file_contents(self, ofrak_context: OFRAKContext, tmp_path):
+        """
+        Test that FilesystemRoot.initialize_from_disk, which reads files concurrently, adds each
+        file with its own contents, in sorted order.
+        """
+        contents = {name: name.encode() * (i + 1) * 1000 for i, name in enumerate("dbeac")}
+        for name, data in contents.items():
+            (tmp_path / name).write_bytes(data)
+
+        resource = await ofrak_context.create_root_resource(
+            name=str(tmp_path), data=b"", tags=[FilesystemRoot]
+        )
+        filesystem_root = await resource.view_as(FilesystemRoot)
+        await filesystem_root.initialize_from_disk(str(tmp_path))
+
+        list_dir_output = await filesystem_root.list_dir()
+        assert list(list_dir_output.keys()) == sorted(contents)
+        for name, entry in list_dir_output.items():
+            assert await entry.resource.get_data() == contents[name]
+
+    async def test_initialize_from_disk_unsupported_file(
+        self, ofrak_context: OFRAKContext, tmp_path, monkeypatch
+    ):
+        """
+        Test that when FilesystemRoot.initialize_from_disk fails on an unsupported file, no reads
+        of the other files in its directory are left running.
+        """
+        reads_in_progress = []
+        lock = threading.Lock()
+
+        def slow_read_file(path: str) -> bytes:
+            with lock:
+                reads_in_progress.append(path)
+            time.sleep(0.05)
+            data = read_file(path)
+            with lock:
+                reads_in_progress.remove(path)
+            return data
+
+        read_file = filesystem._read_file
+        monkeypatch.setattr(filesystem, "_read_file", slow_read_file)
+
+        for name in "abdef":
+            (tmp_path / name).write_bytes(name.encode())
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.bind(str(tmp_path / "c_socket"))
+
+            resource = await ofrak_context.create_root_resource(
+                name=str(tmp_path), data=b"", tags=[FilesystemRoot]
+            )
+            filesystem_root = await resource.view_as(FilesystemRoot)
+            with pytest.raises(NotImplementedError, match="c_socket"):
+                await filesystem_root.initialize_from_disk(str(tmp_path))
+
+        assert reads_in_progress == []
+
     async def test_flush_to_disk(self, ofrak_context: OFRAKContext):
         """
         Test that FilesystemRoot.flush_to_disk correctly flushes the filesystem resources.
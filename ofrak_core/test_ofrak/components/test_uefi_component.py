@@ -1,8 +1,12 @@
+import errno
 import pytest
 import os.path
 from dataclasses import dataclass
+from subprocess import CalledProcessError
+from types import SimpleNamespace
 from typing import Dict
-from ofrak.core.uefi import Uefi
+from ofrak.core import tmpfs
+from ofrak.core.uefi import Uefi, UefiUnpacker, UefiUnpackerConfig, _get_tmpfs_dir
 from ofrak.core.filesystem import File, FilesystemEntry
 from ofrak.resource import Resource
 from ofrak import OFRAKContext
@@ -81,3 +85,90 @@ class TestUefiComponent(UnpackAndVerifyPattern):
         info_str: str = f"",
     ):
         pass
+
+
+class TestUefiComponentTmpfs(TestUefiComponent):
+    async def unpack(self, root_resource: Resource):
+        root_resource.add_tag(Uefi)
+        await root_resource.save()
+        await root_resource.run(UefiUnpacker, UefiUnpackerConfig(use_tmpfs=True))
+
+
+@pytest.fixture
+def tmpfs_path(tmp_path, monkeypatch) -> str:
+    """
+    Point the tmpfs at a temporary directory that reports 1000 bytes free.
+    """
+    monkeypatch.setattr(tmpfs, "TMPFS_PATH", str(tmp_path))
+    monkeypatch.setattr(tmpfs.shutil, "disk_usage", lambda path: SimpleNamespace(free=1000))
+    return str(tmp_path)
+
+
+def test_get_tmpfs_dir(tmpfs_path, monkeypatch):
+    assert _get_tmpfs_dir(999) == tmpfs_path
+    assert _get_tmpfs_dir(1000) is None
+
+    monkeypatch.setattr(tmpfs, "TMPFS_PATH", os.path.join(tmpfs_path, "missing"))
+    assert _get_tmpfs_dir(0) is None
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (OSError(errno.ENOSPC, "No space left on device"), True),
+        (OSError(errno.EACCES, "Permission denied"), False),
+        (CalledProcessError(returncode=1, cmd=["uefiextract"]), False),
+    ],
+)
+async def test_uefi_unpacker_tmpfs_fallback(
+    ofrak_context: OFRAKContext, tmpfs_path, monkeypatch, error, retried
+):
+    """
+    Test that extraction is retried outside the tmpfs only if it ran out of space there.
+    """
+    extract_dirs = []
+
+    async def extract(self, resource, temp_dir_location):
+        extract_dirs.append(temp_dir_location)
+        if temp_dir_location is not None:
+            raise error
+
+    monkeypatch.setattr(UefiUnpacker, "_extract", extract)
+    resource = await ofrak_context.create_root_resource("rom", b"rom", tags=(Uefi,))
+    unpacker = ofrak_context.component_locator.get_by_type(UefiUnpacker)
+
+    if retried:
+        await unpacker.unpack(resource, UefiUnpackerConfig(use_tmpfs=True))
+        assert extract_dirs == [tmpfs_path, None]
+    else:
+        with pytest.raises(type(error)):
+            await unpacker.unpack(resource, UefiUnpackerConfig(use_tmpfs=True))
+        assert extract_dirs == [tmpfs_path]
+
+
+@pytest.mark.parametrize("free_space, expected_error", [(1000, CalledProcessError), (0, OSError)])
+async def test_uefi_unpacker_tmpfs_failure(
+    ofrak_context: OFRAKContext,
+    tmpfs_path,
+    tmp_path_factory,
+    monkeypatch,
+    free_space,
+    expected_error,
+):
+    """
+    Test that a failed `uefiextract` run is reported as running out of space only if the tmpfs
+    filled up.
+    """
+    bin_dir = tmp_path_factory.mktemp("bin")
+    fake_uefiextract = bin_dir / "uefiextract"
+    fake_uefiextract.write_text("#!/bin/sh\nexit 1\n")
+    fake_uefiextract.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(tmpfs.shutil, "disk_usage", lambda path: SimpleNamespace(free=free_space))
+
+    resource = await ofrak_context.create_root_resource("rom", b"rom", tags=(Uefi,))
+    unpacker = ofrak_context.component_locator.get_by_type(UefiUnpacker)
+    with pytest.raises(expected_error) as exc_info:
+        await unpacker._extract(resource, tmpfs_path)
+    if expected_error is OSError:
+        assert exc_info.value.errno == errno.ENOSPC